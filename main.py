@@ -1,7 +1,274 @@
 import wx
+import hashlib
+import html
+import io
+import multiprocessing
+import os
 import sqlite3
 import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 import wx.grid
+from wx.lib.wordwrap import wordwrap
+
+DB_PATH = 'questions.db'
+
+# Настройки резервного копирования
+BACKUP_DIR = 'backups'  # Каталог для снимков базы данных
+BACKUP_KEEP = 10  # Сколько последних снимков хранить
+BACKUP_INTERVAL_MINUTES = 60  # Период автоматического резервного копирования
+BACKUP_PAGES_PER_STEP = 256  # Страниц SQLite за один шаг копирования
+BACKUP_PROGRESS_INTERVAL = 0.2  # Минимальный интервал между отчетами о прогрессе (сек)
+
+# Настройки отображения вариантов ответа в экзамене
+OPTION_MIN_WRAP_WIDTH = 350  # Минимальная ширина переноса текста варианта ответа
+OPTION_WRAP_MARGIN = 60  # Место под флажок и отступы в строке варианта ответа
+RENDER_CACHE_SIZE = 512  # Сколько раскладок вопросов хранить в кэше
+
+# Настройки изображений
+BITMAP_CACHE_BYTES = 64 * 1024 * 1024  # Ограничение памяти кэша декодированных изображений
+QUESTION_IMAGE_SIZE = (600, 300)  # Максимальный размер изображения вопроса
+OPTION_IMAGE_SIZE = (350, 200)  # Максимальный размер изображения варианта ответа
+THUMBNAIL_SIZE = (160, 120)  # Размер миниатюры в списке вопросов
+IMAGE_WILDCARD = "Изображения (*.png;*.jpg;*.jpeg;*.gif;*.bmp)|*.png;*.jpg;*.jpeg;*.gif;*.bmp"
+
+# Настройки генерации печатных вариантов экзамена
+VARIANTS_DIR = 'variants'  # Каталог по умолчанию для вариантов
+VARIANT_FILE_TEMPLATE = "variant_{:04d}.html"
+ANSWER_KEY_FILE = "answer_key.html"
+VARIANT_IMAGES_DIR = "images"  # Подкаталог для изображений, общих для всех вариантов
+
+VARIANT_HTML_HEAD = """<!DOCTYPE html>
+<html lang="ru">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+.question {{ page-break-inside: avoid; margin-bottom: 1.5em; }}
+.options {{ list-style: none; padding-left: 1em; }}
+.options li::before {{ content: "\\2610  "; }}
+table {{ border-collapse: collapse; }}
+td, th {{ border: 1px solid #999; padding: 0.2em 0.6em; vertical-align: top; }}
+.question-image {{ display: block; max-width: 600px; max-height: 300px; margin: 0.3em 0; }}
+.option-image {{ display: block; max-width: 350px; max-height: 200px; margin: 0.3em 0 0 1.5em; }}
+</style>
+</head>
+<body>
+"""
+VARIANT_HTML_TAIL = "</body>\n</html>\n"
+
+
+def get_question_options(question):
+    """Список непустых вариантов ответа вопроса в виде (текст, исходный номер)"""
+    options = []
+    for i in range(2, 8):  # option1 находится в индексе 2, option6 - в индексе 7
+        if i < len(question) and question[i]:
+            options.append((question[i], i - 1))
+    return options
+
+
+def parse_correct_answers(correct_value):
+    """Номера правильных вариантов из поля correct"""
+    # Обрабатываем оба случая: когда correct - число и когда это строка
+    if isinstance(correct_value, int):
+        # Старый формат: одно число
+        return [correct_value]
+    if isinstance(correct_value, str):
+        # Новый формат: строка с числами через запятую
+        return [int(x) for x in correct_value.split(",")] if correct_value else []
+    return []
+
+
+def shuffle_options(question, rng):
+    """Перемешивание вариантов ответа с помощью rng (модуль random или random.Random).
+
+    Возвращает перемешанный список (текст, исходный номер) и индексы правильных
+    вариантов после перемешивания.
+    """
+    options = get_question_options(question)
+    rng.shuffle(options)
+
+    correct_answers = parse_correct_answers(question[8])  # correct находится в индексе 8
+    correct_indices = [idx for idx, (_, original_index) in enumerate(options)
+                       if original_index in correct_answers]
+    return options, correct_indices
+
+
+def variant_rng(seed, number):
+    """Генератор случайных чисел варианта: одинаковые seed и номер дают одинаковый вариант"""
+    # Строковое зерно хешируется детерминированно и не зависит от PYTHONHASHSEED
+    return random.Random(f"{seed}:{number}")
+
+
+def image_extension(data):
+    """Расширение файла по сигнатуре изображения"""
+    signatures = [
+        (b"\x89PNG", ".png"),
+        (b"\xff\xd8", ".jpg"),
+        (b"GIF8", ".gif"),
+        (b"BM", ".bmp"),
+    ]
+    for signature, extension in signatures:
+        if data.startswith(signature):
+            return extension
+    return ""
+
+
+def export_variant_images(db_path, question_ids, output_dir):
+    """Выгрузка изображений вопросов в output_dir/images, по одному файлу на хеш.
+
+    Возвращает {id вопроса: {slot: путь к файлу относительно output_dir}}.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        links = conn.execute("SELECT question_id, slot, hash FROM question_attachments").fetchall()
+        links = [link for link in links if link[0] in question_ids]
+        if not links:
+            return {}
+
+        os.makedirs(os.path.join(output_dir, VARIANT_IMAGES_DIR), exist_ok=True)
+
+        # Каждое изображение читается из базы и записывается на диск один раз
+        paths = {}
+        for attachment_hash in {link[2] for link in links}:
+            row = conn.execute("SELECT data FROM attachments WHERE hash=?", (attachment_hash,)).fetchone()
+            if row is None:
+                continue
+            data = row[0]
+            relative_path = f"{VARIANT_IMAGES_DIR}/{attachment_hash}{image_extension(data)}"
+            path = os.path.join(output_dir, relative_path)
+            if not os.path.exists(path):
+                with open(path, "wb") as f:
+                    f.write(data)
+            paths[attachment_hash] = relative_path
+    finally:
+        conn.close()
+
+    attachments = {}
+    for question_id, slot, attachment_hash in links:
+        if attachment_hash in paths:
+            attachments.setdefault(question_id, {})[slot] = paths[attachment_hash]
+    return attachments
+
+
+def render_variant(questions, number, seed, output_dir, questions_per_variant=None, attachments=None):
+    """Генерация одного варианта экзамена в HTML-файл.
+
+    Файл пишется на диск по мере формирования вопросов. attachments - результат
+    export_variant_images. Возвращает ключ ответов: список (id вопроса,
+    номера правильных вариантов в порядке варианта).
+    """
+    rng = variant_rng(seed, number)
+    attachments = attachments or {}
+
+    # Порядок вопросов в варианте (и выборка, если задано количество)
+    count = len(questions)
+    if questions_per_variant:
+        count = min(count, questions_per_variant)
+    selected = rng.sample(questions, count)
+
+    key = []
+    path = os.path.join(output_dir, VARIANT_FILE_TEMPLATE.format(number))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(VARIANT_HTML_HEAD.format(title=f"Вариант {number}"))
+        f.write(f"<h1>Вариант {number}</h1>\n")
+
+        for position, question in enumerate(selected, start=1):
+            options, correct_indices = shuffle_options(question, rng)
+            key.append((question[0], [idx + 1 for idx in correct_indices]))
+
+            images = attachments.get(question[0], {})
+
+            f.write(f'<div class="question">\n<p><b>{position}.</b> {html.escape(question[1] or "")}</p>\n')
+            if 0 in images:
+                f.write(f'<img class="question-image" src="{html.escape(images[0])}" alt="">\n')
+            f.write('<ol class="options">\n')
+            for option_number, (text, original_index) in enumerate(options, start=1):
+                f.write(f"<li>{option_number}) {html.escape(text)}")
+                if original_index in images:
+                    f.write(f'<img class="option-image" src="{html.escape(images[original_index])}" alt="">')
+                f.write("</li>\n")
+            f.write("</ol>\n</div>\n")
+
+        f.write(VARIANT_HTML_TAIL)
+
+    return key
+
+
+def remove_variant_files(output_dir):
+    """Удаление вариантов и ключа ответов предыдущей генерации, чтобы не смешать их с новыми"""
+    for name in os.listdir(output_dir):
+        if name == ANSWER_KEY_FILE or (name.startswith("variant_") and name.endswith(".html")):
+            os.remove(os.path.join(output_dir, name))
+
+
+# Параметры генерации в процессе-обработчике (задаются один раз инициализатором пула)
+_variant_worker_args = None
+
+
+def _init_variant_worker(questions, seed, output_dir, questions_per_variant, attachments):
+    global _variant_worker_args
+    _variant_worker_args = (questions, seed, output_dir, questions_per_variant, attachments)
+
+
+def _render_variant_task(number):
+    questions, seed, output_dir, questions_per_variant, attachments = _variant_worker_args
+    return number, render_variant(questions, number, seed, output_dir, questions_per_variant, attachments)
+
+
+def generate_exam_variants(questions, count, seed, output_dir=VARIANTS_DIR,
+                           questions_per_variant=None, processes=None, on_progress=None, db_path=None):
+    """Параллельная генерация count вариантов экзамена и общего ключа ответов.
+
+    Варианты распределяются по пулу процессов, каждый процесс пишет свои файлы
+    сам. Ключ ответов дописывается в файл по мере готовности вариантов.
+    Если указан db_path, изображения вопросов выгружаются в каталог вариантов.
+    on_progress(done, count) вызывается после каждого готового варианта.
+    Возвращает путь к файлу ключа ответов.
+    """
+    # Пропускаем некорректные вопросы, как и в режиме экзамена
+    questions = [q for q in questions if len(get_question_options(q)) >= 2]
+    if not questions:
+        raise ValueError("Нет вопросов для генерации вариантов")
+
+    os.makedirs(output_dir, exist_ok=True)
+    key_path = os.path.join(output_dir, ANSWER_KEY_FILE)
+    remove_variant_files(output_dir)
+
+    attachments = {}
+    if db_path:
+        attachments = export_variant_images(db_path, {q[0] for q in questions}, output_dir)
+
+    # spawn вместо fork: дочерние процессы не наследуют состояние GUI
+    context = multiprocessing.get_context("spawn")
+    processes = processes or os.cpu_count() or 1
+    chunksize = max(1, count // (processes * 4))
+
+    with open(key_path, "w", encoding="utf-8") as key_file, \
+            ProcessPoolExecutor(max_workers=processes, mp_context=context,
+                                initializer=_init_variant_worker,
+                                initargs=(questions, seed, output_dir, questions_per_variant,
+                                          attachments)) as pool:
+        key_file.write(VARIANT_HTML_HEAD.format(title="Ключ ответов"))
+        key_file.write(f"<h1>Ключ ответов</h1>\n<p>Зерно генерации: {html.escape(str(seed))}</p>\n")
+
+        for number, key in pool.map(_render_variant_task, range(1, count + 1), chunksize=chunksize):
+            key_file.write(f"<h2>Вариант {number}</h2>\n<table>\n<tr><th>№</th><th>ID вопроса</th><th>Ответ</th></tr>\n")
+            for position, (question_id, correct) in enumerate(key, start=1):
+                answer = ", ".join(str(n) for n in correct)
+                key_file.write(f"<tr><td>{position}</td><td>{question_id}</td><td>{answer}</td></tr>\n")
+            key_file.write("</table>\n")
+
+            if on_progress:
+                on_progress(number, count)
+
+        key_file.write(VARIANT_HTML_TAIL)
+
+    return key_path
 
 
 # Создаем кастомный класс для текстового поля с автоматической высотой и переносом текста
@@ -45,10 +312,274 @@ class AutoWrapTextCtrl(wx.TextCtrl):
         event.Skip()
 
 
+class BackupManager:
+    """Онлайн-резервное копирование базы данных через SQLite backup API.
+
+    Копирование и восстановление выполняются в фоновом потоке небольшими
+    порциями страниц, поэтому интерфейс не блокируется. Результаты
+    передаются через колбэки on_progress(operation, done, total, speed)
+    и on_done(operation, success, message), которые вызываются из фонового потока.
+    """
+
+    def __init__(self, db_path, backup_dir=BACKUP_DIR, keep=BACKUP_KEEP,
+                 on_progress=None, on_done=None):
+        self.db_path = db_path
+        self.backup_dir = backup_dir
+        self.keep = keep
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def is_running(self):
+        """Выполняется ли сейчас копирование или восстановление"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start_backup(self):
+        """Запуск создания снимка в фоновом потоке. Возвращает False, если операция уже идет"""
+        return self._start(self._run_backup)
+
+    def start_restore(self, snapshot_path):
+        """Запуск подготовки восстановления из снимка в фоновом потоке.
+
+        Снимок копируется во временный файл рядом с базой данных и проверяется.
+        Рабочая база не изменяется, пока не будет вызван apply_restore().
+        """
+        return self._start(self._run_restore, snapshot_path)
+
+    @property
+    def restore_path(self):
+        """Временный файл с проверенной копией для восстановления"""
+        return self.db_path + ".restore"
+
+    def apply_restore(self):
+        """Замена базы данных проверенной копией (все соединения с базой должны быть закрыты)"""
+        os.replace(self.restore_path, self.db_path)
+
+    def _start(self, target, *args):
+        with self._lock:
+            if self.is_running():
+                return False
+            self._thread = threading.Thread(target=target, args=args, daemon=True)
+            self._thread.start()
+        return True
+
+    def list_snapshots(self):
+        """Список снимков, от новых к старым"""
+        if not os.path.isdir(self.backup_dir):
+            return []
+        names = [name for name in os.listdir(self.backup_dir)
+                 if name.startswith("questions_") and name.endswith(".db")]
+        # Имена содержат метку времени, поэтому сортировка по имени = по времени
+        return [os.path.join(self.backup_dir, name) for name in sorted(names, reverse=True)]
+
+    def rotate(self):
+        """Удаление старых снимков сверх лимита хранения и незавершенных файлов"""
+        for path in self.list_snapshots()[self.keep:]:
+            os.remove(path)
+
+        for name in os.listdir(self.backup_dir):
+            if name.endswith(".db.part"):
+                os.remove(os.path.join(self.backup_dir, name))
+
+    @staticmethod
+    def check_integrity(path):
+        """Проверка целостности файла базы данных"""
+        conn = sqlite3.connect(path)
+        try:
+            result = conn.execute("PRAGMA integrity_check").fetchone()
+            return result is not None and result[0] == "ok"
+        except sqlite3.DatabaseError:
+            return False
+        finally:
+            conn.close()
+
+    def _copy(self, operation, source_path, target_path):
+        """Постраничное копирование source_path в target_path, возвращает (байт, секунд)"""
+        src = sqlite3.connect(source_path)
+        dst = sqlite3.connect(target_path)
+        try:
+            page_size = src.execute("PRAGMA page_size").fetchone()[0]
+            started = time.monotonic()
+            last_report = [0.0]
+
+            def progress(status, remaining, total):
+                now = time.monotonic()
+                if now - last_report[0] < BACKUP_PROGRESS_INTERVAL and remaining:
+                    return
+                last_report[0] = now
+                done = total - remaining
+                elapsed = now - started
+                speed = done * page_size / elapsed if elapsed > 0 else 0.0
+                if self.on_progress:
+                    self.on_progress(operation, done, total, speed)
+
+            src.backup(dst, pages=BACKUP_PAGES_PER_STEP, progress=progress)
+            size = dst.execute("PRAGMA page_count").fetchone()[0] * page_size
+            return size, time.monotonic() - started
+        finally:
+            dst.close()
+            src.close()
+
+    @staticmethod
+    def has_questions_table(path):
+        """Содержит ли файл базы данных таблицу вопросов"""
+        conn = sqlite3.connect(path)
+        try:
+            row = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='questions'").fetchone()
+            return row is not None
+        except sqlite3.DatabaseError:
+            return False
+        finally:
+            conn.close()
+
+    def _create_snapshot(self):
+        """Создание снимка рабочей базы данных, возвращает (путь, байт, секунд)"""
+        os.makedirs(self.backup_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        target_path = os.path.join(self.backup_dir, f"questions_{stamp}.db")
+        # Пишем во временный файл, чтобы неполный снимок не попал в список
+        part_path = target_path + ".part"
+
+        try:
+            size, elapsed = self._copy("backup", self.db_path, part_path)
+            os.replace(part_path, target_path)
+        except Exception:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+
+        self.rotate()
+        return target_path, size, elapsed
+
+    def _run_backup(self):
+        try:
+            target_path, size, elapsed = self._create_snapshot()
+            self._finish("backup", True, self._summary(target_path, size, elapsed))
+        except Exception as e:
+            self._finish("backup", False, str(e))
+
+    def _run_restore(self, snapshot_path):
+        try:
+            if not self.check_integrity(snapshot_path):
+                self._finish("restore", False, f"Снимок {snapshot_path} поврежден")
+                return
+
+            if not self.has_questions_table(snapshot_path):
+                self._finish("restore", False, f"Файл {snapshot_path} не содержит таблицы вопросов")
+                return
+
+            # Копируем во временный файл, рабочая база остается нетронутой
+            if os.path.exists(self.restore_path):
+                os.remove(self.restore_path)
+            size, elapsed = self._copy("restore", snapshot_path, self.restore_path)
+
+            if not self.check_integrity(self.restore_path):
+                os.remove(self.restore_path)
+                self._finish("restore", False, "Проверка целостности после копирования не пройдена")
+                return
+
+            # Снимок текущей базы, чтобы ошибочное восстановление можно было отменить
+            previous_path, _, _ = self._create_snapshot()
+
+            self._finish("restore", True, f"{self._summary(snapshot_path, size, elapsed)}; "
+                                          f"предыдущая версия сохранена в {os.path.basename(previous_path)}")
+        except Exception as e:
+            if os.path.exists(self.restore_path):
+                os.remove(self.restore_path)
+            self._finish("restore", False, str(e))
+
+    @staticmethod
+    def _summary(path, size, elapsed):
+        speed = size / elapsed if elapsed > 0 else 0.0
+        return (f"{os.path.basename(path)}: {size / 1024 / 1024:.1f} МБ "
+                f"за {elapsed:.1f} с ({speed / 1024 / 1024:.1f} МБ/с)")
+
+    def _finish(self, operation, success, message):
+        if self.on_done:
+            self.on_done(operation, success, message)
+
+
+class BitmapCache:
+    """LRU-кэш декодированных изображений с ограничением занимаемой памяти.
+
+    Изображения декодируются только при первом обращении и вытесняются,
+    начиная с давно не использованных, когда суммарный размер превышает max_bytes.
+    """
+
+    def __init__(self, max_bytes=BITMAP_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items = OrderedDict()  # ключ -> (bitmap, размер в байтах)
+
+    def get(self, key, loader):
+        """Изображение из кэша или, при промахе, результат loader()"""
+        if key in self._items:
+            self._items.move_to_end(key)
+            return self._items[key][0]
+
+        bitmap = loader()
+        if bitmap is None:
+            return None
+
+        cost = bitmap.GetWidth() * bitmap.GetHeight() * 4  # RGBA
+        self._items[key] = (bitmap, cost)
+        self.size += cost
+
+        # Вытесняем самые старые изображения, но не только что добавленное
+        while self.size > self.max_bytes and len(self._items) > 1:
+            _, (_, old_cost) = self._items.popitem(last=False)
+            self.size -= old_cost
+
+        return bitmap
+
+    def clear(self):
+        self._items.clear()
+        self.size = 0
+
+
+class RenderCache:
+    """LRU-кэш раскладок вариантов ответа по ключу (id вопроса, ширина, шрифт)"""
+
+    def __init__(self, max_items=RENDER_CACHE_SIZE):
+        self.max_items = max_items
+        self._items = OrderedDict()
+
+    def get(self, key, builder):
+        """Раскладка из кэша или, при промахе, результат builder()"""
+        if key in self._items:
+            self._items.move_to_end(key)
+            return self._items[key]
+
+        layout = builder()
+        self._items[key] = layout
+        if len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+        return layout
+
+    def clear(self):
+        self._items.clear()
+
+
+def decode_bitmap(data, max_width, max_height):
+    """Декодирование изображения с уменьшением до заданного размера"""
+    image = wx.Image(io.BytesIO(data))
+    if not image.IsOk():
+        return None
+
+    width, height = image.GetWidth(), image.GetHeight()
+    scale = min(max_width / width, max_height / height, 1.0)
+    if scale < 1.0:
+        image = image.Scale(max(1, int(width * scale)), max(1, int(height * scale)), wx.IMAGE_QUALITY_HIGH)
+
+    return wx.Bitmap(image)
+
+
 class MainWindow(wx.Frame):
     def __init__(self):
         super().__init__(parent=None, title='Exam Application', size=(1000, 700))
         self.init_db()
+        self.bitmap_cache = BitmapCache()
 
         # Создание Notebook (вкладок)
         self.notebook = wx.Notebook(self)
@@ -64,21 +595,191 @@ class MainWindow(wx.Frame):
         self.notebook.AddPage(self.exam_panel, "Экзамен")
         self.notebook.AddPage(self.manage_panel, "Управление вопросами")
 
+        # Резервное копирование (колбэки вызываются из фонового потока)
+        self.backup_manager = BackupManager(
+            DB_PATH,
+            on_progress=lambda *args: wx.CallAfter(self.on_backup_progress, *args),
+            on_done=lambda *args: wx.CallAfter(self.on_backup_done, *args)
+        )
+        self.variants_thread = None  # Фоновый поток генерации вариантов
+        self.init_menu()
+        self.CreateStatusBar()
+
+        # Таймер автоматического резервного копирования
+        self.backup_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.on_backup_timer, self.backup_timer)
+        self.backup_timer.Start(BACKUP_INTERVAL_MINUTES * 60 * 1000)
+
         self.Centre()
         self.Show()
 
         # Обработчик закрытия окна
         self.Bind(wx.EVT_CLOSE, self.on_close)
 
+    def init_menu(self):
+        """Создание меню приложения"""
+        menu_bar = wx.MenuBar()
+
+        file_menu = wx.Menu()
+        backup_item = file_menu.Append(wx.ID_ANY, "Создать резервную копию\tCtrl+B")
+        restore_item = file_menu.Append(wx.ID_ANY, "Восстановить из резервной копии...")
+        file_menu.AppendSeparator()
+        variants_item = file_menu.Append(wx.ID_ANY, "Сгенерировать варианты для печати...")
+        file_menu.AppendSeparator()
+        exit_item = file_menu.Append(wx.ID_EXIT, "Выход")
+
+        self.Bind(wx.EVT_MENU, self.on_backup, backup_item)
+        self.Bind(wx.EVT_MENU, self.on_restore, restore_item)
+        self.Bind(wx.EVT_MENU, self.on_generate_variants, variants_item)
+        self.Bind(wx.EVT_MENU, lambda event: self.Close(), exit_item)
+
+        menu_bar.Append(file_menu, "Файл")
+        self.SetMenuBar(menu_bar)
+
     def on_close(self, event):
         """Закрытие соединения с БД при выходе"""
+        self.backup_timer.Stop()
         if hasattr(self, 'conn'):
             self.conn.close()
         event.Skip()
 
+    def on_backup_timer(self, event):
+        """Автоматическое резервное копирование по расписанию"""
+        self.backup_manager.start_backup()
+
+    def on_backup(self, event):
+        """Создание резервной копии по запросу"""
+        if not self.backup_manager.start_backup():
+            wx.MessageBox("Резервное копирование или восстановление уже выполняется",
+                          "Внимание", wx.OK | wx.ICON_INFORMATION)
+
+    def on_restore(self, event):
+        """Восстановление базы данных из выбранного снимка"""
+        if self.backup_manager.is_running():
+            wx.MessageBox("Резервное копирование или восстановление уже выполняется",
+                          "Внимание", wx.OK | wx.ICON_INFORMATION)
+            return
+
+        with wx.FileDialog(self, "Выберите резервную копию",
+                           defaultDir=os.path.abspath(BACKUP_DIR),
+                           wildcard="База данных (*.db)|*.db",
+                           style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST) as dialog:
+            if dialog.ShowModal() != wx.ID_OK:
+                return
+            snapshot_path = dialog.GetPath()
+
+        confirm = wx.MessageBox("Текущие вопросы будут заменены содержимым резервной копии. Продолжить?",
+                                "Подтверждение восстановления",
+                                wx.YES_NO | wx.ICON_QUESTION)
+        if confirm == wx.YES and self.backup_manager.start_restore(snapshot_path):
+            # Пока идет восстановление, работа с вопросами недоступна
+            self.notebook.Disable()
+
+    def on_generate_variants(self, event):
+        """Генерация печатных вариантов экзамена с ключом ответов"""
+        # Два запуска в один каталог перезаписали бы файлы друг друга
+        if self.variants_thread is not None and self.variants_thread.is_alive():
+            wx.MessageBox("Генерация вариантов уже выполняется", "Внимание", wx.OK | wx.ICON_INFORMATION)
+            return
+
+        self.cursor.execute("SELECT * FROM questions ORDER BY id")
+        questions = self.cursor.fetchall()
+        if not questions:
+            wx.MessageBox("Нет вопросов для генерации вариантов!", "Внимание", wx.OK | wx.ICON_INFORMATION)
+            return
+
+        count = wx.GetNumberFromUser("Количество вариантов:", "", "Генерация вариантов", 200, 1, 10000, self)
+        if count == -1:
+            return
+
+        per_variant = wx.GetNumberFromUser("Вопросов в варианте (0 - все вопросы):", "",
+                                           "Генерация вариантов", min(50, len(questions)),
+                                           0, len(questions), self)
+        if per_variant == -1:
+            return
+
+        # Зерно позволяет в точности повторить любой вариант
+        seed = wx.GetNumberFromUser("Зерно генерации (одинаковое зерно дает одинаковые варианты):", "",
+                                    "Генерация вариантов", random.randint(1, 999999), 0, 999999, self)
+        if seed == -1:
+            return
+
+        with wx.DirDialog(self, "Каталог для вариантов", defaultPath=os.path.abspath(VARIANTS_DIR)) as dialog:
+            if dialog.ShowModal() != wx.ID_OK:
+                return
+            output_dir = dialog.GetPath()
+
+        def run():
+            try:
+                key_path = generate_exam_variants(
+                    questions, count, seed, output_dir, per_variant or None, db_path=DB_PATH,
+                    on_progress=lambda done, total: wx.CallAfter(
+                        self.SetStatusText, f"Генерация вариантов: {done}/{total}")
+                )
+                wx.CallAfter(self.on_variants_done, True, key_path)
+            except Exception as e:
+                wx.CallAfter(self.on_variants_done, False, str(e))
+
+        self.SetStatusText("Генерация вариантов...")
+        self.variants_thread = threading.Thread(target=run, daemon=True)
+        self.variants_thread.start()
+
+    def on_variants_done(self, success, message):
+        """Завершение генерации вариантов"""
+        if success:
+            self.SetStatusText(f"Варианты сгенерированы, ключ ответов: {message}")
+            wx.MessageBox(f"Варианты сгенерированы!\n\nКлюч ответов: {message}", "Успех",
+                          wx.OK | wx.ICON_INFORMATION)
+        else:
+            self.SetStatusText("Ошибка генерации вариантов")
+            wx.MessageBox(f"Ошибка генерации вариантов: {message}", "Ошибка", wx.OK | wx.ICON_ERROR)
+
+    def on_backup_progress(self, operation, done, total, speed):
+        """Отображение прогресса и скорости копирования в строке состояния"""
+        title = "Резервное копирование" if operation == "backup" else "Восстановление"
+        percent = done * 100 // total if total else 100
+        self.SetStatusText(f"{title}: {percent}% ({done}/{total} страниц, {speed / 1024 / 1024:.1f} МБ/с)")
+
+    def on_backup_done(self, operation, success, message):
+        """Завершение копирования или восстановления"""
+        if operation == "backup":
+            if success:
+                self.SetStatusText(f"Резервная копия создана: {message}")
+            else:
+                self.SetStatusText("Ошибка резервного копирования")
+                wx.MessageBox(f"Ошибка резервного копирования: {message}", "Ошибка", wx.OK | wx.ICON_ERROR)
+            return
+
+        self.notebook.Enable()
+
+        if success:
+            # Подменяем файл базы данных проверенной копией при закрытом соединении
+            self.conn.close()
+            try:
+                self.backup_manager.apply_restore()
+            except Exception as e:
+                success, message = False, str(e)
+            finally:
+                # Переподключаемся, в том числе чтобы создать таблицы, отсутствующие в старых снимках
+                self.init_db()
+
+        if success:
+            self.SetStatusText(f"База данных восстановлена: {message}")
+
+            # Обновляем списки вопросов на панелях и сбрасываем форму,
+            # которая могла редактировать вопрос из замененной базы
+            self.exam_panel.load_questions()
+            self.manage_panel.load_questions()
+            self.add_question_panel.clear_form()
+
+            wx.MessageBox(f"База данных восстановлена!\n\n{message}", "Успех", wx.OK | wx.ICON_INFORMATION)
+        else:
+            self.SetStatusText("Ошибка восстановления")
+            wx.MessageBox(f"Ошибка восстановления: {message}", "Ошибка", wx.OK | wx.ICON_ERROR)
+
     def init_db(self):
         """Инициализация базы данных с поддержкой нескольких правильных ответов"""
-        self.conn = sqlite3.connect('questions.db')
+        self.conn = sqlite3.connect(DB_PATH)
         self.cursor = self.conn.cursor()
 
         # Создаем новую таблицу
@@ -96,8 +797,76 @@ class MainWindow(wx.Frame):
             )
         ''')
 
+        # Изображения хранятся один раз по хешу содержимого
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS attachments (
+                hash TEXT PRIMARY KEY,
+                data BLOB
+            )
+        ''')
+
+        # Привязка изображений к вопросам: slot 0 - вопрос, 1-6 - варианты ответов
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS question_attachments (
+                question_id INTEGER,
+                slot INTEGER,
+                hash TEXT,
+                PRIMARY KEY (question_id, slot)
+            )
+        ''')
+
+        # Индекс для проверки, используется ли изображение другими вопросами
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_question_attachments_hash ON question_attachments (hash)")
+
         self.conn.commit()
 
+    def store_attachment(self, data):
+        """Сохранение изображения в базе без дубликатов (без commit), возвращает его хеш"""
+        attachment_hash = hashlib.sha256(data).hexdigest()
+        self.cursor.execute("INSERT OR IGNORE INTO attachments (hash, data) VALUES (?, ?)",
+                            (attachment_hash, sqlite3.Binary(data)))
+        return attachment_hash
+
+    def get_question_attachments(self, question_id):
+        """Хеши изображений вопроса в виде {slot: hash} (сами изображения не загружаются)"""
+        self.cursor.execute("SELECT slot, hash FROM question_attachments WHERE question_id=?", (question_id,))
+        return dict(self.cursor.fetchall())
+
+    def save_question_attachments(self, question_id, attachments):
+        """Замена привязанных к вопросу изображений (без commit)"""
+        old_hashes = set(self.get_question_attachments(question_id).values())
+        self.cursor.execute("DELETE FROM question_attachments WHERE question_id=?", (question_id,))
+        self.cursor.executemany(
+            "INSERT INTO question_attachments (question_id, slot, hash) VALUES (?, ?, ?)",
+            [(question_id, slot, attachment_hash) for slot, attachment_hash in attachments.items()]
+        )
+        self.delete_unreferenced_attachments(old_hashes - set(attachments.values()))
+
+    def delete_question_attachments(self, question_id):
+        """Удаление привязок удаляемого вопроса и ставших ненужными изображений (без commit)"""
+        old_hashes = set(self.get_question_attachments(question_id).values())
+        self.cursor.execute("DELETE FROM question_attachments WHERE question_id=?", (question_id,))
+        self.delete_unreferenced_attachments(old_hashes)
+
+    def delete_unreferenced_attachments(self, hashes):
+        """Удаление изображений из hashes, на которые больше не ссылается ни один вопрос (без commit)"""
+        # Проверяются только переданные хеши, поэтому стоимость не зависит от размера банка
+        self.cursor.executemany(
+            "DELETE FROM attachments WHERE hash=? "
+            "AND NOT EXISTS (SELECT 1 FROM question_attachments WHERE hash=?)",
+            [(attachment_hash, attachment_hash) for attachment_hash in hashes]
+        )
+
+    def get_attachment_bitmap(self, attachment_hash, size):
+        """Изображение, уменьшенное до size, декодируется при первом обращении"""
+        def load():
+            self.cursor.execute("SELECT data FROM attachments WHERE hash=?", (attachment_hash,))
+            row = self.cursor.fetchone()
+            return decode_bitmap(row[0], *size) if row else None
+
+        return self.bitmap_cache.get((attachment_hash, size), load)
+
 
 class AddQuestionPanel(wx.Panel):
     def __init__(self, parent, main_window):
@@ -106,6 +875,8 @@ class AddQuestionPanel(wx.Panel):
         self.option_texts = []  # Список для хранения текстовых полей
         self.option_checks = []  # Список для хранения флажков правильности
         self.editing_id = None  # ID вопроса для редактирования (None для нового вопроса)
+        self.attachments = {}  # Прикрепленные изображения: {slot: (hash, данные или None, если уже в базе)}
+        self.option_image_buttons = []  # Кнопки изображений вариантов ответов
         self.init_ui()
 
     def init_ui(self):
@@ -120,6 +891,8 @@ class AddQuestionPanel(wx.Panel):
         question_sizer.Add(wx.StaticText(self.scroll_panel, label="Вопрос:"), 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
         self.question_text = AutoWrapTextCtrl(self.scroll_panel, size=(400, 60))
         question_sizer.Add(self.question_text, 1, wx.ALL | wx.EXPAND, 5)
+        self.question_image_button = self.create_image_button(0)
+        question_sizer.Add(self.question_image_button, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
         vbox.Add(question_sizer, 0, wx.EXPAND | wx.ALL, 5)
 
         # Заголовок для вариантов ответов
@@ -187,6 +960,11 @@ class AddQuestionPanel(wx.Panel):
         option_text = AutoWrapTextCtrl(self.scroll_panel, size=(300, 40))
         option_sizer.Add(option_text, 1, wx.ALL | wx.EXPAND, 5)
 
+        # Кнопка прикрепления изображения к варианту
+        image_button = self.create_image_button(len(self.option_texts) + 1)
+        self.option_image_buttons.append(image_button)
+        option_sizer.Add(image_button, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+
         self.options_container.Add(option_sizer, 0, wx.EXPAND | wx.ALL, 5)
         self.option_texts.append(option_text)
 
@@ -210,12 +988,59 @@ class AddQuestionPanel(wx.Panel):
             # Удаляем из списков
             self.option_texts.pop()
             self.option_checks.pop()
+            self.option_image_buttons.pop()
+            self.attachments.pop(last_index + 1, None)
 
             self.scroll_panel.Layout()
             self.scroll_panel.SetVirtualSize(self.options_container.GetMinSize())
         else:
             wx.MessageBox("Минимальное количество вариантов - 2", "Информация", wx.OK | wx.ICON_INFORMATION)
 
+    def create_image_button(self, slot):
+        """Кнопка прикрепления изображения (slot 0 - вопрос, 1-6 - варианты ответов)"""
+        button = wx.Button(self.scroll_panel, label="Изображение...")
+        button.Bind(wx.EVT_BUTTON, lambda event: self.on_toggle_image(slot))
+        return button
+
+    def get_image_button(self, slot):
+        if slot == 0:
+            return self.question_image_button
+        return self.option_image_buttons[slot - 1]
+
+    def update_image_buttons(self):
+        """Обновление надписей кнопок в соответствии с прикрепленными изображениями"""
+        for slot in range(len(self.option_image_buttons) + 1):
+            label = "Убрать изображение" if slot in self.attachments else "Изображение..."
+            self.get_image_button(slot).SetLabel(label)
+        self.scroll_panel.Layout()
+
+    def on_toggle_image(self, slot):
+        """Прикрепление изображения или его удаление, если оно уже прикреплено"""
+        if slot in self.attachments:
+            del self.attachments[slot]
+            self.update_image_buttons()
+            return
+
+        with wx.FileDialog(self, "Выберите изображение", wildcard=IMAGE_WILDCARD,
+                           style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST) as dialog:
+            if dialog.ShowModal() != wx.ID_OK:
+                return
+            path = dialog.GetPath()
+
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+
+            if not wx.Image(io.BytesIO(data)).IsOk():
+                wx.MessageBox("Не удалось прочитать изображение!", "Ошибка", wx.OK | wx.ICON_ERROR)
+                return
+
+            # В базу изображение попадет только при сохранении вопроса
+            self.attachments[slot] = (hashlib.sha256(data).hexdigest(), data)
+            self.update_image_buttons()
+        except Exception as e:
+            wx.MessageBox(f"Ошибка: {str(e)}", "Ошибка", wx.OK | wx.ICON_ERROR)
+
     def on_add_option(self, event):
         self.add_option()
 
@@ -268,6 +1093,7 @@ class AddQuestionPanel(wx.Panel):
 
                 query = f"INSERT INTO questions ({', '.join(columns)}) VALUES ({placeholders})"
                 self.main_window.cursor.execute(query, values)
+                question_id = self.main_window.cursor.lastrowid
                 action = "добавлен"
             else:
                 # Обновление существующего вопроса
@@ -291,8 +1117,18 @@ class AddQuestionPanel(wx.Panel):
 
                 query = f"UPDATE questions SET {', '.join(columns)} WHERE id=?"
                 self.main_window.cursor.execute(query, values)
+                question_id = self.editing_id
                 action = "обновлен"
 
+            # Сохраняем изображения в той же транзакции, что и ссылки на них,
+            # и удаляем больше не используемые
+            links = {}
+            for slot, (attachment_hash, data) in self.attachments.items():
+                if data is not None:
+                    attachment_hash = self.main_window.store_attachment(data)
+                links[slot] = attachment_hash
+            self.main_window.save_question_attachments(question_id, links)
+
             self.main_window.conn.commit()
 
             # Обновляем списки вопросов на других панелях
@@ -304,16 +1140,20 @@ class AddQuestionPanel(wx.Panel):
 
             wx.MessageBox(f"Вопрос {action}!", "Успех", wx.OK | wx.ICON_INFORMATION)
         except Exception as e:
+            # Отменяем незавершенные изменения, чтобы их не зафиксировал следующий commit
+            self.main_window.conn.rollback()
             wx.MessageBox(f"Ошибка: {str(e)}", "Ошибка", wx.OK | wx.ICON_ERROR)
 
     def clear_form(self):
         """Очистка формы"""
         self.question_text.Clear()
+        self.attachments = {}
 
         # Очищаем контейнер вариантов
         self.options_container.Clear(True)
         self.option_texts = []
         self.option_checks = []
+        self.option_image_buttons = []
 
         # Добавляем начальные два варианта ответа
         self.add_option()
@@ -322,7 +1162,7 @@ class AddQuestionPanel(wx.Panel):
         # Сбрасываем режим редактирования
         self.set_editing_mode(None)
 
-        self.scroll_panel.Layout()
+        self.update_image_buttons()
 
     def set_editing_mode(self, question_id=None):
         """Переключение в режим редактирования"""
@@ -341,6 +1181,7 @@ class AddQuestionPanel(wx.Panel):
                 self.options_container.Clear(True)
                 self.option_texts = []
                 self.option_checks = []
+                self.option_image_buttons = []
 
                 # Добавляем варианты ответов
                 for i in range(2, 8):  # option1 находится в индексе 2, option6 - в индексе 7
@@ -353,6 +1194,11 @@ class AddQuestionPanel(wx.Panel):
                     if str(i + 1) in correct_values:
                         check.SetValue(True)
 
+                # Загружаем привязки изображений (сами изображения не декодируются)
+                self.attachments = {slot: (attachment_hash, None) for slot, attachment_hash
+                                    in self.main_window.get_question_attachments(question_id).items()}
+                self.update_image_buttons()
+
                 # Меняем текст кнопки
                 self.save_button.SetLabel("Обновить вопрос")
 
@@ -381,6 +1227,11 @@ class AddQuestionPanel(wx.Panel):
         option_text.SetValue(value)
         option_sizer.Add(option_text, 1, wx.ALL | wx.EXPAND, 5)
 
+        # Кнопка прикрепления изображения к варианту
+        image_button = self.create_image_button(len(self.option_texts) + 1)
+        self.option_image_buttons.append(image_button)
+        option_sizer.Add(image_button, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+
         self.options_container.Add(option_sizer, 0, wx.EXPAND | wx.ALL, 5)
         self.option_texts.append(option_text)
 
@@ -397,6 +1248,8 @@ class ExamPanel(wx.Panel):
         self.questions = []
         self.asked_question_ids = set()  # Множество ID заданных вопросов
         self.available_question_ids = set()  # Множество ID доступных вопросов
+        self.correct_texts = []  # Тексты правильных вариантов текущего вопроса
+        self.render_cache = RenderCache()  # Перенесенные тексты и размеры вариантов ответа
         self.init_ui()
         self.load_questions()
 
@@ -411,6 +1264,11 @@ class ExamPanel(wx.Panel):
         self.question_text.SetBackgroundColour(self.GetBackgroundColour())
         self.vbox.Add(self.question_text, 0, wx.EXPAND | wx.ALL, 10)
 
+        # Изображение вопроса (показывается, только если прикреплено)
+        self.question_image = wx.StaticBitmap(self)
+        self.question_image.Hide()
+        self.vbox.Add(self.question_image, 0, wx.ALIGN_CENTER | wx.ALL, 5)
+
         # Инструкция
         self.instruction = wx.StaticText(self, label="Выберите все правильные ответы:")
         self.vbox.Add(self.instruction, 0, wx.ALL, 5)
@@ -449,6 +1307,7 @@ class ExamPanel(wx.Panel):
         """Загрузка всех вопросов из базы данных"""
         self.main_window.cursor.execute("SELECT * FROM questions")
         self.questions = self.main_window.cursor.fetchall()
+        self.render_cache.clear()
 
         # Создаем множество ID всех доступных вопросов
         self.available_question_ids = {q[0] for q in self.questions}
@@ -460,6 +1319,8 @@ class ExamPanel(wx.Panel):
         """Перезагрузка вопросов из базы данных"""
         self.main_window.cursor.execute("SELECT * FROM questions")
         self.questions = self.main_window.cursor.fetchall()
+        # Тексты вопросов могли измениться, раскладки нужно пересчитать
+        self.render_cache.clear()
 
         # Обновляем множество доступных вопросов
         self.available_question_ids = {q[0] for q in self.questions}
@@ -482,6 +1343,30 @@ class ExamPanel(wx.Panel):
 
         return None
 
+    def get_option_layout(self, question):
+        """Перенесенные тексты и размеры вариантов ответа: {исходный номер: (текст, размер)}.
+
+        Измерение текста выполняется один раз для сочетания вопроса, ширины и шрифта.
+        """
+        # Место под вертикальную полосу прокрутки резервируется всегда: она может появиться
+        # после добавления вариантов, а горизонтальная прокрутка отключена
+        scrollbar_width = wx.SystemSettings.GetMetric(wx.SYS_VSCROLL_X, self.scroll)
+        available_width = self.scroll.GetSize().width - scrollbar_width - OPTION_WRAP_MARGIN
+        wrap_width = max(OPTION_MIN_WRAP_WIDTH, available_width)
+        font = self.scroll.GetFont()
+
+        def measure():
+            dc = wx.ClientDC(self.scroll)
+            dc.SetFont(font)
+            layout = {}
+            for text, original_index in get_question_options(question):
+                wrapped = wordwrap(text, wrap_width, dc)
+                layout[original_index] = (wrapped, dc.GetMultiLineTextExtent(wrapped))
+            return layout
+
+        key = (question[0], wrap_width, font.GetNativeFontInfoDesc())
+        return self.render_cache.get(key, measure)
+
     def load_question(self):
         """Загрузка случайного вопроса из доступных вопросов"""
         self.clear_options()
@@ -500,10 +1385,7 @@ class ExamPanel(wx.Panel):
         self.asked_question_ids.add(question_id)
 
         # Собираем все непустые варианты ответов
-        options = []
-        for i in range(2, 8):  # option1 находится в индексе 2, option6 - в индексе 7
-            if i < len(self.current_question) and self.current_question[i]:
-                options.append((self.current_question[i], i - 1))  # (текст, исходный номер)
+        options = get_question_options(self.current_question)
 
         if not options or len(options) < 2:
             # Если вопрос некорректный, пропускаем его и загружаем следующий
@@ -513,48 +1395,50 @@ class ExamPanel(wx.Panel):
         # Устанавливаем текст вопроса
         self.question_text.SetValue(self.current_question[1])
 
-        # Перемешиваем варианты ответов
-        random.shuffle(options)
-
-        # Получаем правильные ответы
-        correct_value = self.current_question[8]  # correct находится в индексе 8
+        # Перемешиваем варианты ответов и запоминаем, какие из них правильные после перемешивания
+        options, self.correct_indices = shuffle_options(self.current_question, random)
+        self.correct_texts = [options[i][0] for i in self.correct_indices]
 
-        # Обрабатываем оба случая: когда correct - число и когда это строка
-        if isinstance(correct_value, int):
-            # Старый формат: одно число
-            correct_answers = [correct_value]
-        elif isinstance(correct_value, str):
-            # Новый формат: строка с числами через запятую
-            correct_answers = [int(x) for x in correct_value.split(",")] if correct_value else []
+        # Изображения декодируются только для показываемого вопроса
+        attachments = self.main_window.get_question_attachments(question_id)
+        if 0 in attachments:
+            self.question_image.SetBitmap(
+                self.main_window.get_attachment_bitmap(attachments[0], QUESTION_IMAGE_SIZE) or wx.NullBitmap)
+            self.question_image.Show()
         else:
-            correct_answers = []
-
-        # Запоминаем, какие варианты являются правильными после перемешивания
-        self.correct_indices = []
-        for idx, (text, original_index) in enumerate(options):
-            if original_index in correct_answers:
-                self.correct_indices.append(idx)
+            self.question_image.Hide()
 
         # Создаем чекбоксы для каждого варианта ответа
-        self.check_boxes = []
-        for i, (option_text, _) in enumerate(options):
-            # Используем StaticText с переносом для текста варианта ответа
-            option_sizer = wx.BoxSizer(wx.HORIZONTAL)
-            cb = wx.CheckBox(self.scroll)
-            option_sizer.Add(cb, 0, wx.ALL | wx.ALIGN_TOP, 5)
-
-            # Создаем статический текст с переносом
-            option_label = wx.StaticText(self.scroll, label=option_text, style=wx.ALIGN_LEFT)
-            option_label.Wrap(350)  # Перенос текста по ширине
-            option_sizer.Add(option_label, 1, wx.ALL | wx.EXPAND, 5)
-
-            self.scroll_sizer.Add(option_sizer, 0, wx.EXPAND | wx.ALL, 5)
-            self.check_boxes.append(cb)
-
-        # Обновляем макет
-        self.scroll_sizer.Layout()
-        self.scroll.SetVirtualSize(self.scroll_sizer.GetMinSize())
-        self.Layout()
+        layout = self.get_option_layout(self.current_question)
+        # Блокируем перерисовку на время перестроения; разблокировка гарантирована и при ошибке
+        with wx.WindowUpdateLocker(self):
+            self.check_boxes = []
+            for _, original_index in options:
+                option_sizer = wx.BoxSizer(wx.HORIZONTAL)
+                cb = wx.CheckBox(self.scroll)
+                option_sizer.Add(cb, 0, wx.ALL | wx.ALIGN_TOP, 5)
+
+                # Текст уже перенесен и измерен, поэтому размер задается сразу
+                wrapped_text, text_size = layout[original_index]
+                content_sizer = wx.BoxSizer(wx.VERTICAL)
+                option_label = wx.StaticText(self.scroll, label=wrapped_text, size=text_size,
+                                             style=wx.ALIGN_LEFT | wx.ST_NO_AUTORESIZE)
+                content_sizer.Add(option_label, 0, wx.ALL, 5)
+
+                # Изображение варианта ответа
+                if original_index in attachments:
+                    bitmap = self.main_window.get_attachment_bitmap(attachments[original_index], OPTION_IMAGE_SIZE)
+                    if bitmap:
+                        content_sizer.Add(wx.StaticBitmap(self.scroll, bitmap=bitmap), 0, wx.ALL, 5)
+
+                option_sizer.Add(content_sizer, 1, wx.EXPAND)
+                self.scroll_sizer.Add(option_sizer, 0, wx.EXPAND | wx.ALL, 5)
+                self.check_boxes.append(cb)
+
+            # Обновляем макет
+            self.scroll_sizer.Layout()
+            self.scroll.SetVirtualSize(self.scroll_sizer.GetMinSize())
+            self.Layout()
 
         # Показываем элементы интерфейса
         self.instruction.Show()
@@ -568,6 +1452,7 @@ class ExamPanel(wx.Panel):
             "Вы ответили на все доступные вопросы!\n\nНажмите 'Начать новую сессию', чтобы начать заново.")
 
         # Скрываем элементы интерфейса
+        self.question_image.Hide()
         self.instruction.Hide()
         self.scroll.Hide()
         self.check_button.Hide()
@@ -592,17 +1477,8 @@ class ExamPanel(wx.Panel):
         if set(selected_indices) == set(self.correct_indices):
             wx.MessageBox("Правильно! Все ответы верные.", "Результат", wx.OK | wx.ICON_INFORMATION)
         else:
-            # Формируем список правильных ответов
-            correct_texts = []
-            for i in self.correct_indices:
-                # Получаем текст из StaticText
-                option_sizer = self.scroll_sizer.GetItem(i).GetSizer()
-                if option_sizer and option_sizer.GetItemCount() > 1:
-                    option_label = option_sizer.GetItem(1).GetWindow()
-                    if isinstance(option_label, wx.StaticText):
-                        correct_texts.append(option_label.GetLabel())
-
-            correct_str = "\n- ".join(correct_texts)
+            # Тексты правильных ответов сохранены при загрузке вопроса
+            correct_str = "\n- ".join(self.correct_texts)
             wx.MessageBox(f"Неправильно!\n\nПравильные ответы:\n- {correct_str}",
                           "Результат", wx.OK | wx.ICON_ERROR)
 
@@ -637,8 +1513,14 @@ class ManageQuestionsPanel(wx.Panel):
         self.questions_list.InsertColumn(1, "Вопрос", width=300)
         self.questions_list.InsertColumn(2, "Варианты ответов", width=300)
         self.questions_list.InsertColumn(3, "Правильные ответы", width=100)
+        self.questions_list.InsertColumn(4, "Изображения", width=90)
+        self.questions_list.Bind(wx.EVT_LIST_ITEM_SELECTED, self.on_question_selected)
         vbox.Add(self.questions_list, 1, wx.EXPAND | wx.ALL, 10)
 
+        # Миниатюра изображения выбранного вопроса (загружается при выборе строки)
+        self.preview = wx.StaticBitmap(self, size=THUMBNAIL_SIZE)
+        vbox.Add(self.preview, 0, wx.ALIGN_CENTER | wx.ALL, 5)
+
         # Кнопки управления
         btn_sizer = wx.BoxSizer(wx.HORIZONTAL)
 
@@ -666,6 +1548,12 @@ class ManageQuestionsPanel(wx.Panel):
         self.main_window.cursor.execute("SELECT * FROM questions ORDER BY id")
         questions = self.main_window.cursor.fetchall()
 
+        # Количество изображений у вопросов (без загрузки самих изображений)
+        self.main_window.cursor.execute(
+            "SELECT question_id, COUNT(*) FROM question_attachments GROUP BY question_id")
+        attachment_counts = dict(self.main_window.cursor.fetchall())
+        self.preview.SetBitmap(wx.NullBitmap)
+
         # Добавляем вопросы в список
         for question in questions:
             index = self.questions_list.InsertItem(self.questions_list.GetItemCount(), str(question[0]))
@@ -681,6 +1569,9 @@ class ManageQuestionsPanel(wx.Panel):
             # Правильные ответы
             self.questions_list.SetItem(index, 3, question[8] if len(question) > 8 else "")
 
+            # Количество изображений
+            self.questions_list.SetItem(index, 4, str(attachment_counts.get(question[0], "")))
+
     def get_selected_question_id(self):
         """Получение ID выбранного вопроса"""
         selection = self.questions_list.GetFirstSelected()
@@ -688,6 +1579,20 @@ class ManageQuestionsPanel(wx.Panel):
             return None
         return int(self.questions_list.GetItemText(selection))
 
+    def on_question_selected(self, event):
+        """Показ миниатюры изображения выбранного вопроса"""
+        question_id = int(self.questions_list.GetItemText(event.GetIndex()))
+        attachments = self.main_window.get_question_attachments(question_id)
+
+        bitmap = None
+        if attachments:
+            # Изображение вопроса, а если его нет - первого варианта с изображением
+            attachment_hash = attachments[min(attachments)]
+            bitmap = self.main_window.get_attachment_bitmap(attachment_hash, THUMBNAIL_SIZE)
+
+        self.preview.SetBitmap(bitmap or wx.NullBitmap)
+        self.Layout()
+
     def on_edit_question(self, event):
         """Редактирование выбранного вопроса"""
         question_id = self.get_selected_question_id()
@@ -717,6 +1622,7 @@ class ManageQuestionsPanel(wx.Panel):
             try:
                 # Удаляем вопрос из базы данных
                 self.main_window.cursor.execute("DELETE FROM questions WHERE id=?", (question_id,))
+                self.main_window.delete_question_attachments(question_id)
                 self.main_window.conn.commit()
 
                 # Обновляем списки вопросов на других панелях
@@ -733,6 +1639,7 @@ class ManageQuestionsPanel(wx.Panel):
         wx.MessageBox("Список вопросов обновлен!", "Информация", wx.OK | wx.ICON_INFORMATION)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     app = wx.App()
     frame = MainWindow()
     app.MainLoop()
\ No newline at end of file